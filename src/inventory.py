@@ -0,0 +1,202 @@
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from sortedcontainers import SortedList
+from typing import Dict, List, Optional, Set, Tuple
+from user_auth import Role, hash_password, needs_rehash, verify_password
+
+class User:
+    __slots__ = ('username', 'password', 'role')
+
+    def __init__(self, username: str, password: str, role: Role):
+        self.username = username
+        self.password = self._hash_password(password)
+        self.role = role
+
+    @classmethod
+    def from_hash(cls, username: str, password_hash: str, role: Role) -> "User":
+        user = cls.__new__(cls)
+        user.username = username
+        user.password = password_hash
+        user.role = role
+        return user
+
+    def _hash_password(self, password: str) -> str:
+        return hash_password(password)
+
+    def check_password(self, password: str) -> bool:
+        return self.check_password_bytes(password.encode('utf-8'))
+
+    def check_password_bytes(self, password: bytes) -> bool:
+        if not verify_password(self.password, password):
+            return False
+        # Upgrade legacy SHA-256 digests and outdated Argon2 parameters on login
+        if needs_rehash(self.password):
+            self.password = hash_password(password)
+        return True
+
+class Product:
+    __slots__ = ('product_id', '_name', 'name_lc', '_category', 'category_lc',
+                 '_price', '_stock_quantity', 'last_updated')
+
+    def __init__(self, product_id: int, name: str, category: str, price: float, stock_quantity: int):
+        self.product_id = product_id
+        self._apply(name, category, price, stock_quantity)
+
+    # Fields are read-only properties so that InventorySystem.update_product
+    # stays the single write path and the search and stock indexes never drift
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def price(self) -> float:
+        return self._price
+
+    @property
+    def stock_quantity(self) -> int:
+        return self._stock_quantity
+
+    def _apply(self, name: str = None, category: str = None,
+               price: float = None, stock_quantity: int = None):
+        # Package-internal: called by InventorySystem.update_product, which then
+        # refreshes the indexes. Lowercased copies are stored so searches never
+        # re-lowercase
+        if name is not None:
+            self._name = name
+            self.name_lc = name.lower()
+        if category is not None:
+            self._category = category
+            self.category_lc = category.lower()
+        if price is not None:
+            self._price = price
+        if stock_quantity is not None:
+            self._stock_quantity = stock_quantity
+        self.last_updated = time.time_ns()
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+_SEARCH_CACHE_SIZE = 64
+
+class SearchIndex:
+    # Lowercased text and a trigram index kept alongside the products dict,
+    # so searches only verify candidates instead of scanning every product
+    def __init__(self):
+        self._text: Dict[int, Tuple[str, str]] = {}
+        self._trigram_idx: Dict[str, Set[int]] = {}
+        # NUL-separated text of every product for terms too short to index,
+        # rebuilt lazily after mutations
+        self._buf: Optional[str] = None
+        self._buf_ids: List[int] = []
+        self._buf_offsets: List[int] = []
+        # Recent results keyed by (generation, term); any mutation bumps the
+        # generation so stale entries are never hit and age out of the LRU
+        self._generation = 0
+        self._cache: "OrderedDict[Tuple[int, str], Tuple[int, ...]]" = OrderedDict()
+
+    # Callers pass text already lowercased (Product.name_lc / category_lc)
+    def add(self, product_id: int, name_lc: str, category_lc: str):
+        self._text[product_id] = (name_lc, category_lc)
+        self._buf = None
+        self._generation += 1
+        for gram in _trigrams(name_lc) | _trigrams(category_lc):
+            self._trigram_idx.setdefault(gram, set()).add(product_id)
+
+    def remove(self, product_id: int):
+        name_lc, category_lc = self._text.pop(product_id)
+        self._buf = None
+        self._generation += 1
+        for gram in _trigrams(name_lc) | _trigrams(category_lc):
+            posting = self._trigram_idx[gram]
+            posting.discard(product_id)
+            if not posting:
+                del self._trigram_idx[gram]
+
+    def update(self, product_id: int, name_lc: str, category_lc: str):
+        self.remove(product_id)
+        self.add(product_id, name_lc, category_lc)
+
+    def _build_buffer(self):
+        self._buf_ids = list(self._text)
+        self._buf_offsets = []
+        parts = []
+        pos = 0
+        for product_id in self._buf_ids:
+            name_lc, category_lc = self._text[product_id]
+            self._buf_offsets.append(pos)
+            parts.append(f"{name_lc}\0{category_lc}\0")
+            pos += len(parts[-1])
+        self._buf = "".join(parts)
+
+    def _scan(self, search_term: str) -> List[int]:
+        # One str.find pass over the whole buffer runs in C; after a hit, jump
+        # to the start of the next product so each product matches at most once
+        if not self._text:
+            return []
+        if self._buf is None:
+            self._build_buffer()
+        hits = []
+        pos = self._buf.find(search_term)
+        while pos != -1:
+            i = bisect_right(self._buf_offsets, pos) - 1
+            hits.append(self._buf_ids[i])
+            if i + 1 == len(self._buf_offsets):
+                break
+            pos = self._buf.find(search_term, self._buf_offsets[i + 1])
+        return sorted(hits)
+
+    def search(self, search_term: str) -> List[int]:
+        if not self._text:
+            return []
+        key = (self._generation, search_term)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._cache[key] = tuple(self._search(search_term.lower()))
+            if len(self._cache) > _SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return list(result)
+
+    def _search(self, search_term: str) -> List[int]:
+        if len(search_term) < 3:
+            if "\0" in search_term:
+                candidates = self._text.keys()
+            else:
+                return self._scan(search_term)
+        else:
+            postings = [self._trigram_idx.get(gram) for gram in _trigrams(search_term)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        return sorted(product_id for product_id in candidates
+                      if search_term in self._text[product_id][0] or
+                      search_term in self._text[product_id][1])
+
+class StockIndex:
+    # (stock, product_id) pairs kept sorted by stock, so a low-stock query
+    # bisects once and walks only the matching prefix: O(log N + k log k).
+    # Results are returned in product-id order, i.e. the order products were added
+    def __init__(self):
+        self._by_stock = SortedList()
+        self._stock: Dict[int, int] = {}
+
+    def set(self, product_id: int, stock_quantity: int):
+        old_stock = self._stock.get(product_id)
+        if old_stock is not None:
+            self._by_stock.remove((old_stock, product_id))
+        self._stock[product_id] = stock_quantity
+        self._by_stock.add((stock_quantity, product_id))
+
+    def remove(self, product_id: int):
+        self._by_stock.remove((self._stock.pop(product_id), product_id))
+
+    def at_or_below(self, threshold: float) -> List[int]:
+        end = self._by_stock.bisect_right((threshold, float("inf")))
+        return sorted(product_id for _, product_id in self._by_stock.islice(0, end))
@@ -1,109 +1,101 @@
-import hashlib
-from datetime import datetime
-from typing import List, Dict, Optional
-
-class User:
-    def __init__(self, username: str, password: str, role: str):
-        self.username = username
-        self.password = self._hash_password(password)
-        self.role = role
-
-    def _hash_password(self, password: str) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
-
-    def check_password(self, password: str) -> bool:
-        return self._hash_password(password) == self.password
-
-class Product:
-    def __init__(self, product_id: int, name: str, category: str, price: float, stock_quantity: int):
-        self.product_id = product_id
-        self.name = name
-        self.category = category
-        self.price = price
-        self.stock_quantity = stock_quantity
-        self.last_updated = datetime.now()
-
-    def update_stock(self, quantity: int):
-        self.stock_quantity = quantity
-        self.last_updated = datetime.now()
+from typing import List, Dict, Optional, Tuple
+from inventory import Product, SearchIndex, StockIndex, User
+from user_auth import Role, hash_passwords
 
 class InventorySystem:
     def __init__(self):
         self.users: Dict[str, User] = {}
         self.products: Dict[int, Product] = {}
+        self._next_pid = 1
+        self._search_index = SearchIndex()
+        self._stock_index = StockIndex()
         self.current_user: Optional[User] = None
         self.stock_threshold = 5
         self._initialize_system()
 
     def _initialize_system(self):
         # Create default admin user
-        self.add_user("admin", "admin123", "Admin")
+        self.add_user("admin", "admin123", Role.ADMIN)
         # Create default regular user
-        self.add_user("user", "user123", "User")
+        self.add_user("user", "user123", Role.USER)
 
-    def add_user(self, username: str, password: str, role: str) -> bool:
+    def add_user(self, username: str, password: str, role: Role) -> bool:
         if username not in self.users:
             self.users[username] = User(username, password, role)
             return True
         return False
 
+    def add_users_bulk(self, users: List[Tuple[str, str, Role]]) -> int:
+        # Skip usernames that already exist or repeat within the batch
+        new_users = {}
+        for username, password, role in users:
+            if username not in self.users and username not in new_users:
+                new_users[username] = (password, role)
+        hashes = hash_passwords([password for password, _ in new_users.values()])
+        for (username, (_, role)), password_hash in zip(new_users.items(), hashes):
+            self.users[username] = User.from_hash(username, password_hash, role)
+        return len(new_users)
+
     def login(self, username: str, password: str) -> bool:
-        if username in self.users and self.users[username].check_password(password):
+        pw_b = password.encode('utf-8')
+        if username in self.users and self.users[username].check_password_bytes(pw_b):
             self.current_user = self.users[username]
             return True
         return False
 
     def add_product(self, name: str, category: str, price: float, stock_quantity: int) -> bool:
-        if not self.current_user or self.current_user.role != "Admin":
+        if self.current_user is None or self.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can add products")
         
-        product_id = len(self.products) + 1
-        self.products[product_id] = Product(product_id, name, category, price, stock_quantity)
+        # Ids are never reused, even after a product is deleted
+        product_id = self._next_pid
+        self._next_pid += 1
+        product = Product(product_id, name, category, price, stock_quantity)
+        self.products[product_id] = product
+        self._search_index.add(product_id, product.name_lc, product.category_lc)
+        self._stock_index.set(product_id, stock_quantity)
         return True
 
     def update_product(self, product_id: int, name: str = None, category: str = None, 
                       price: float = None, stock_quantity: int = None) -> bool:
-        if not self.current_user or self.current_user.role != "Admin":
+        if self.current_user is None or self.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can update products")
         
         if product_id not in self.products:
             raise ValueError("Product not found")
         
         product = self.products[product_id]
-        if name is not None:
-            product.name = name
-        if category is not None:
-            product.category = category
-        if price is not None:
-            product.price = price
+        product._apply(name, category, price, stock_quantity)
+        if name is not None or category is not None:
+            self._search_index.update(product_id, product.name_lc, product.category_lc)
         if stock_quantity is not None:
-            product.stock_quantity = stock_quantity
-            
-        product.last_updated = datetime.now()
+            self._stock_index.set(product_id, stock_quantity)
         return True
 
+    def update_stock(self, product_id: int, quantity: int) -> bool:
+        return self.update_product(product_id, stock_quantity=quantity)
+
     def delete_product(self, product_id: int) -> bool:
-        if not self.current_user or self.current_user.role != "Admin":
+        if self.current_user is None or self.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can delete products")
         
         if product_id not in self.products:
             raise ValueError("Product not found")
         
         del self.products[product_id]
+        self._search_index.remove(product_id)
+        self._stock_index.remove(product_id)
         return True
 
     def get_product(self, product_id: int) -> Optional[Product]:
         return self.products.get(product_id)
 
     def search_products(self, search_term: str) -> List[Product]:
-        search_term = search_term.lower()
-        return [product for product in self.products.values()
-                if search_term in product.name.lower() or 
-                search_term in product.category.lower()]
+        return [self.products[product_id] for product_id in self._search_index.search(search_term)]
 
     def get_low_stock_products(self) -> List[Product]:
-        return [product for product in self.products.values()
-                if product.stock_quantity <= self.stock_threshold]
+        return [self.products[product_id]
+                for product_id in self._stock_index.at_or_below(self.stock_threshold)]
 
 def main():
     inventory = InventorySystem()
@@ -133,12 +125,12 @@ def main():
                 break
         
         else:
-            print(f"\n=== Welcome {inventory.current_user.username} ({inventory.current_user.role}) ===")
+            print(f"\n=== Welcome {inventory.current_user.username} ({inventory.current_user.role.name.title()}) ===")
             print("1. View all products")
             print("2. Search products")
             print("3. View low stock products")
             
-            if inventory.current_user.role == "Admin":
+            if inventory.current_user.role is Role.ADMIN:
                 print("4. Add product")
                 print("5. Update product")
                 print("6. Delete product")
@@ -179,7 +171,7 @@ def main():
                     else:
                         print("No low stock products!")
                 
-                elif choice == "4" and inventory.current_user.role == "Admin":
+                elif choice == "4" and inventory.current_user.role is Role.ADMIN:
                     name = input("Product name: ")
                     category = input("Category: ")
                     price = float(input("Price: "))
@@ -188,7 +180,7 @@ def main():
                     if inventory.add_product(name, category, price, stock):
                         print("Product added successfully!")
                 
-                elif choice == "5" and inventory.current_user.role == "Admin":
+                elif choice == "5" and inventory.current_user.role is Role.ADMIN:
                     product_id = int(input("Enter product ID to update: "))
                     name = input("New name (press enter to skip): ")
                     category = input("New category (press enter to skip): ")
@@ -208,7 +200,7 @@ def main():
                     if inventory.update_product(product_id, **updates):
                         print("Product updated successfully!")
                 
-                elif choice == "6" and inventory.current_user.role == "Admin":
+                elif choice == "6" and inventory.current_user.role is Role.ADMIN:
                     product_id = int(input("Enter product ID to delete: "))
                     if inventory.delete_product(product_id):
                         print("Product deleted successfully!")
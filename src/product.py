@@ -1,34 +1,34 @@
 # streamlit code
 import streamlit as st
-import hashlib
-from datetime import datetime
-from typing import Dict, List, Optional
-
-# Original classes remain largely the same
-class User:
-    def __init__(self, username: str, password: str, role: str):
-        self.username = username
-        self.password = self._hash_password(password)
-        self.role = role
-
-    def _hash_password(self, password: str) -> str:
-        return hashlib.sha256(password.encode()).hexdigest()
-
-    def check_password(self, password: str) -> bool:
-        return self._hash_password(password) == self.password
-
-class Product:
-    def __init__(self, product_id: int, name: str, category: str, price: float, stock_quantity: int):
-        self.product_id = product_id
-        self.name = name
-        self.category = category
-        self.price = price
-        self.stock_quantity = stock_quantity
-        self.last_updated = datetime.now()
-
-    def update_stock(self, quantity: int):
-        self.stock_quantity = quantity
-        self.last_updated = datetime.now()
+import pandas as pd
+import threading
+import uuid
+from dateutil import tz
+from typing import Dict, List, Optional, Tuple
+from inventory import Product, SearchIndex, StockIndex, User
+from user_auth import Role, hash_passwords
+
+def _empty_products_df() -> pd.DataFrame:
+    # Display columns for the products table, kept in step with the products dict
+    return pd.DataFrame({
+        "Name": pd.Series(dtype=object),
+        "Category": pd.Series(dtype=object),
+        "price_f": pd.Series(dtype="float64"),
+        "stock_i": pd.Series(dtype="int64"),
+        "updated_ns": pd.Series(dtype="int64"),
+    }, index=pd.Index([], dtype="int64", name="ID"))
+
+PAGE_SIZE = 100
+
+def _format_products(df: pd.DataFrame) -> pd.DataFrame:
+    # Column-wise formatting of products_df rows for st.dataframe; tzlocal applies
+    # each row's own UTC offset, so timestamps across a DST change stay correct
+    return df.assign(
+        Price=df.price_f.map("${:.2f}".format),
+        Stock=df.stock_i,
+        **{"Last Updated": pd.to_datetime(df.updated_ns, unit="ns", utc=True)
+           .dt.tz_convert(tz.tzlocal()).dt.strftime("%Y-%m-%d %H:%M")}
+    ).reset_index()
 
 class InventorySystem:
     def __init__(self):
@@ -36,6 +36,14 @@ class InventorySystem:
         if 'users' not in st.session_state:
             st.session_state.users = {}
             st.session_state.products = {}
+            st.session_state.search_index = SearchIndex()
+            st.session_state.stock_index = StockIndex()
+            st.session_state.products_df = _empty_products_df()
+            st.session_state.next_pid = 1
+            st.session_state.next_pid_lock = threading.Lock()
+            # Bumped on every product mutation to invalidate cached search rows
+            st.session_state.mut_gen = 0
+            st.session_state.session_id = uuid.uuid4().hex
             st.session_state.current_user = None
             st.session_state.stock_threshold = 5
             self._initialize_system()
@@ -47,18 +55,30 @@ class InventorySystem:
         self.stock_threshold = st.session_state.stock_threshold
 
     def _initialize_system(self):
-        self.add_user("admin", "admin123", "Admin")
-        self.add_user("user", "user123", "User")
+        self.add_user("admin", "admin123", Role.ADMIN)
+        self.add_user("user", "user123", Role.USER)
 
     # Rest of the methods remain similar but use session state
-    def add_user(self, username: str, password: str, role: str) -> bool:
+    def add_user(self, username: str, password: str, role: Role) -> bool:
         if username not in st.session_state.users:
             st.session_state.users[username] = User(username, password, role)
             return True
         return False
 
+    def add_users_bulk(self, users: List[Tuple[str, str, Role]]) -> int:
+        # Skip usernames that already exist or repeat within the batch
+        new_users = {}
+        for username, password, role in users:
+            if username not in st.session_state.users and username not in new_users:
+                new_users[username] = (password, role)
+        hashes = hash_passwords([password for password, _ in new_users.values()])
+        for (username, (_, role)), password_hash in zip(new_users.items(), hashes):
+            st.session_state.users[username] = User.from_hash(username, password_hash, role)
+        return len(new_users)
+
     def login(self, username: str, password: str) -> bool:
-        if username in st.session_state.users and st.session_state.users[username].check_password(password):
+        pw_b = password.encode('utf-8')
+        if username in st.session_state.users and st.session_state.users[username].check_password_bytes(pw_b):
             st.session_state.current_user = st.session_state.users[username]
             return True
         return False
@@ -67,46 +87,75 @@ class InventorySystem:
         st.session_state.current_user = None
 
     def add_product(self, name: str, category: str, price: float, stock_quantity: int) -> bool:
-        if not st.session_state.current_user or st.session_state.current_user.role != "Admin":
+        if st.session_state.current_user is None or st.session_state.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can add products")
         
-        product_id = len(st.session_state.products) + 1
-        st.session_state.products[product_id] = Product(product_id, name, category, price, stock_quantity)
+        # Ids are never reused, and reruns of the same session may overlap
+        with st.session_state.next_pid_lock:
+            product_id = st.session_state.next_pid
+            st.session_state.next_pid += 1
+        product = Product(product_id, name, category, price, stock_quantity)
+        st.session_state.products[product_id] = product
+        st.session_state.products_df.loc[product_id] = [name, category, float(price),
+                                                         int(stock_quantity), product.last_updated]
+        st.session_state.search_index.add(product_id, product.name_lc, product.category_lc)
+        st.session_state.stock_index.set(product_id, stock_quantity)
+        st.session_state.mut_gen += 1
         return True
 
-    def update_product(self, product_id: int, **kwargs) -> bool:
-        if not st.session_state.current_user or st.session_state.current_user.role != "Admin":
+    def update_product(self, product_id: int, name: str = None, category: str = None,
+                       price: float = None, stock_quantity: int = None) -> bool:
+        if st.session_state.current_user is None or st.session_state.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can update products")
         
         if product_id not in st.session_state.products:
             raise ValueError("Product not found")
         
         product = st.session_state.products[product_id]
-        for key, value in kwargs.items():
-            if value is not None:
-                setattr(product, key, value)
-        product.last_updated = datetime.now()
+        product._apply(name, category, price, stock_quantity)
+        if name is not None or category is not None:
+            st.session_state.search_index.update(product_id, product.name_lc, product.category_lc)
+        if stock_quantity is not None:
+            st.session_state.stock_index.set(product_id, stock_quantity)
+        st.session_state.products_df.loc[product_id] = [product.name, product.category, float(product.price),
+                                                        int(product.stock_quantity), product.last_updated]
+        st.session_state.mut_gen += 1
         return True
 
+    def update_stock(self, product_id: int, quantity: int) -> bool:
+        return self.update_product(product_id, stock_quantity=quantity)
+
     def delete_product(self, product_id: int) -> bool:
-        if not st.session_state.current_user or st.session_state.current_user.role != "Admin":
+        if st.session_state.current_user is None or st.session_state.current_user.role is not Role.ADMIN:
             raise PermissionError("Only admins can delete products")
         
         if product_id not in st.session_state.products:
             raise ValueError("Product not found")
         
         del st.session_state.products[product_id]
+        st.session_state.search_index.remove(product_id)
+        st.session_state.stock_index.remove(product_id)
+        st.session_state.products_df.drop(product_id, inplace=True)
+        st.session_state.mut_gen += 1
         return True
 
     def get_low_stock_products(self) -> List[Product]:
-        return [product for product in st.session_state.products.values()
-                if product.stock_quantity <= self.stock_threshold]
+        return [st.session_state.products[product_id]
+                for product_id in st.session_state.stock_index.at_or_below(self.stock_threshold)]
 
     def search_products(self, search_term: str) -> List[Product]:
-        search_term = search_term.lower()
-        return [product for product in st.session_state.products.values()
-                if search_term in product.name.lower() or 
-                search_term in product.category.lower()]
+        return [st.session_state.products[product_id]
+                for product_id in st.session_state.search_index.search(search_term)]
+
+# st.cache_data is shared by all sessions, so the session id is part of the key;
+# _inventory is left out of the hash by its leading underscore
+@st.cache_data(max_entries=128)
+def _search_rows(_inventory: InventorySystem, search_term: str, mutation_gen: int,
+                 session_id: str) -> pd.DataFrame:
+    results = _inventory.search_products(search_term)
+    search_data = _format_products(
+        st.session_state.products_df.loc[[product.product_id for product in results]])
+    return search_data[["ID", "Name", "Category", "Price", "Stock"]]
 
 def main():
     st.set_page_config(page_title="Inventory Management System", layout="wide")
@@ -132,7 +181,7 @@ def main():
                     st.error(f"Error: {str(e)}")
         else:
             st.write(f"Logged in as: {st.session_state.current_user.username}")
-            st.write(f"Role: {st.session_state.current_user.role}")
+            st.write(f"Role: {st.session_state.current_user.role.name.title()}")
             if st.button("Logout"):
                 inventory.logout()
                 st.rerun()
@@ -146,7 +195,7 @@ def main():
             st.header("Products")
             
             # Admin functions
-            if st.session_state.current_user.role == "Admin":
+            if st.session_state.current_user.role is Role.ADMIN:
                 with st.expander("Add New Product"):
                     col1, col2 = st.columns(2)
                     with col1:
@@ -165,21 +214,16 @@ def main():
 
             # Display products table
             if st.session_state.products:
-                product_data = []
-                for product in st.session_state.products.values():
-                    product_data.append({
-                        "ID": product.product_id,
-                        "Name": product.name,
-                        "Category": product.category,
-                        "Price": f"${product.price:.2f}",
-                        "Stock": product.stock_quantity,
-                        "Last Updated": product.last_updated.strftime("%Y-%m-%d %H:%M")
-                    })
-                
-                st.dataframe(product_data)
+                # Only the visible page is formatted and sent to the browser
+                df = st.session_state.products_df
+                page_count = (len(df) + PAGE_SIZE - 1) // PAGE_SIZE
+                page = st.number_input("Page", min_value=1, max_value=page_count, step=1) if page_count > 1 else 1
+                start = (page - 1) * PAGE_SIZE
+                product_data = _format_products(df.iloc[start:start + PAGE_SIZE])
+                st.dataframe(product_data[["ID", "Name", "Category", "Price", "Stock", "Last Updated"]])
                 
                 # Admin edit/delete functions
-                if st.session_state.current_user.role == "Admin":
+                if st.session_state.current_user.role is Role.ADMIN:
                     with st.expander("Edit/Delete Product"):
                         product_id = st.number_input("Product ID", min_value=1, step=1)
                         if st.button("Delete Product"):
@@ -220,17 +264,9 @@ def main():
             st.header("Search Products")
             search_term = st.text_input("Enter search term")
             if search_term:
-                results = inventory.search_products(search_term)
-                if results:
-                    search_data = []
-                    for product in results:
-                        search_data.append({
-                            "ID": product.product_id,
-                            "Name": product.name,
-                            "Category": product.category,
-                            "Price": f"${product.price:.2f}",
-                            "Stock": product.stock_quantity
-                        })
+                search_data = _search_rows(inventory, search_term, st.session_state.mut_gen,
+                                           st.session_state.session_id)
+                if not search_data.empty:
                     st.dataframe(search_data)
                 else:
                     st.info("No products found")
@@ -239,15 +275,9 @@ def main():
             st.header("Low Stock Products")
             low_stock = inventory.get_low_stock_products()
             if low_stock:
-                low_stock_data = []
-                for product in low_stock:
-                    low_stock_data.append({
-                        "ID": product.product_id,
-                        "Name": product.name,
-                        "Category": product.category,
-                        "Stock": product.stock_quantity
-                    })
-                st.dataframe(low_stock_data)
+                low_stock_data = st.session_state.products_df.loc[[product.product_id for product in low_stock]]
+                st.dataframe(low_stock_data.rename(columns={"stock_i": "Stock"})
+                             .reset_index()[["ID", "Name", "Category", "Stock"]])
             else:
                 st.info("No products with low stock")
 
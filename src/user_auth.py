@@ -0,0 +1,49 @@
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+from typing import List, Union
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+class Role(IntEnum):
+    ADMIN = 1
+    USER = 2
+
+# Argon2id with OWASP's 46 MiB / t=2 / p=1 profile
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=46 * 1024, parallelism=1)
+# Below this many passwords the thread pool costs more than it saves
+_MIN_PARALLEL_BATCH = 4
+
+def sha256_one(data: bytes) -> bytes:
+    # Single seam for the SHA-256 backend. hashlib is backed by OpenSSL, which
+    # already picks SHA-NI, AVX2 or SSSE3 code at runtime from CPUID
+    return hashlib.sha256(data).digest()
+
+def hash_password(password: Union[str, bytes]) -> str:
+    return _password_hasher.hash(password)
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    # argon2-cffi releases the GIL while hashing, so a thread pool scales across cores
+    if len(passwords) < _MIN_PARALLEL_BATCH:
+        return [hash_password(password) for password in passwords]
+    with ThreadPoolExecutor(max_workers=min(len(passwords), os.cpu_count() or 1)) as pool:
+        return list(pool.map(hash_password, passwords))
+
+def is_legacy_hash(password_hash: str) -> bool:
+    # Hashes created before the Argon2 migration are bare SHA-256 hex digests
+    return not password_hash.startswith("$argon2")
+
+def verify_password(password_hash: str, password: Union[str, bytes]) -> bool:
+    if isinstance(password, str):
+        password = password.encode()
+    if is_legacy_hash(password_hash):
+        return hmac.compare_digest(sha256_one(password).hex(), password_hash)
+    try:
+        return _password_hasher.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def needs_rehash(password_hash: str) -> bool:
+    return is_legacy_hash(password_hash) or _password_hasher.check_needs_rehash(password_hash)
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from main import InventorySystem
+
+def _random_text(rng: random.Random) -> str:
+    return "".join(rng.choice("abcAB ") for _ in range(rng.randint(1, 8)))
+
+def _expected_search(inventory: InventorySystem, search_term: str):
+    search_term = search_term.lower()
+    return sorted(product.product_id for product in inventory.products.values()
+                  if search_term in product.name.lower() or
+                  search_term in product.category.lower())
+
+def _expected_low_stock(inventory: InventorySystem):
+    return sorted(product.product_id for product in inventory.products.values()
+                  if product.stock_quantity <= inventory.stock_threshold)
+
+@pytest.fixture
+def inventory():
+    inventory = InventorySystem()
+    assert inventory.login("admin", "admin123")
+    return inventory
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexes_match_linear_scan(inventory, seed):
+    rng = random.Random(seed)
+    for step in range(400):
+        action = rng.random()
+        if action < 0.5 or not inventory.products:
+            inventory.add_product(_random_text(rng), _random_text(rng), 1.0, rng.randint(0, 10))
+        elif action < 0.8:
+            product_id = rng.choice(list(inventory.products))
+            inventory.update_product(product_id,
+                                     name=_random_text(rng) if rng.random() < 0.5 else None,
+                                     category=_random_text(rng) if rng.random() < 0.5 else None,
+                                     stock_quantity=rng.randint(0, 10) if rng.random() < 0.5 else None)
+        elif action < 0.9:
+            inventory.update_stock(rng.choice(list(inventory.products)), rng.randint(0, 10))
+        else:
+            inventory.delete_product(rng.choice(list(inventory.products)))
+
+        # Repeat terms so the result cache is hit between mutations
+        for search_term in ["", "a", "B", "ab", "a b", "abc", _random_text(rng)[:rng.randint(1, 5)]]:
+            results = [product.product_id for product in inventory.search_products(search_term)]
+            assert sorted(results) == _expected_search(inventory, search_term)
+        low_stock = [product.product_id for product in inventory.get_low_stock_products()]
+        assert sorted(low_stock) == _expected_low_stock(inventory)
+
+def test_product_ids_are_not_reused_after_delete(inventory):
+    inventory.add_product("first", "misc", 1.0, 1)
+    inventory.add_product("second", "misc", 1.0, 1)
+    inventory.delete_product(1)
+    inventory.add_product("third", "misc", 1.0, 1)
+
+    assert sorted(inventory.products) == [2, 3]
+    assert inventory.get_product(2).name == "second"
+    assert inventory.get_product(3).name == "third"
+
+def test_products_reject_direct_field_assignment(inventory):
+    inventory.add_product("Apple", "Fruit", 1.0, 50)
+    product = inventory.get_product(1)
+    for field, value in [("name", "Kiwi"), ("category", "Veg"), ("price", 2.0), ("stock_quantity", 0)]:
+        with pytest.raises(AttributeError):
+            setattr(product, field, value)
+    assert [p.name for p in inventory.search_products("apple")] == ["Apple"]
+    assert inventory.search_products("kiwi") == []
+
+def test_rename_through_update_product_reaches_search(inventory):
+    inventory.add_product("Apple", "Fruit", 1.0, 50)
+    assert inventory.search_products("apple")
+    inventory.update_product(1, name="Kiwi")
+    assert inventory.search_products("apple") == []
+    assert [p.name_lc for p in inventory.search_products("KIWI")] == ["kiwi"]
+
+def test_low_stock_with_fractional_threshold(inventory):
+    for stock in (5, 6, 0):
+        inventory.add_product("item", "misc", 1.0, stock)
+    inventory.stock_threshold = 5.5
+    assert [product.stock_quantity for product in inventory.get_low_stock_products()] == [5, 0]
+
+def test_low_stock_keeps_insertion_order(inventory):
+    for name, stock in [("pear", 4), ("fig", 0), ("plum", 9), ("lime", 2)]:
+        inventory.add_product(name, "fruit", 1.0, stock)
+    inventory.update_stock(1, 1)
+    assert [product.name for product in inventory.get_low_stock_products()] == ["pear", "fig", "lime"]
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "product.py")
+
+def _widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+def _add_product(at, name, category, price=0.0, stock=0):
+    _widget(at.text_input, "Product Name").input(name)
+    _widget(at.text_input, "Category").input(category)
+    _widget(at.number_input, "Price").set_value(price)
+    _widget(at.number_input, "Stock Quantity").set_value(stock)
+    _widget(at.button, "Add Product").click().run()
+    assert not at.exception
+
+def _products_table(at):
+    # The Products tab renders first
+    return at.dataframe[0].value
+
+@pytest.fixture
+def at():
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    at.sidebar.text_input[0].input("admin")
+    at.sidebar.text_input[1].input("admin123")
+    at.sidebar.button[0].click().run()
+    assert not at.exception
+    return at
+
+def test_products_table_follows_add_update_delete(at):
+    _add_product(at, "Widget", "Tools", 2.5, 3)
+    _add_product(at, "Gadget", "Toys", 10.0, 7)
+    table = _products_table(at)
+    assert table[["ID", "Name", "Category", "Price", "Stock"]].values.tolist() == [
+        [1, "Widget", "Tools", "$2.50", 3],
+        [2, "Gadget", "Toys", "$10.00", 7],
+    ]
+
+    _widget(at.number_input, "Product ID").set_value(2)
+    _widget(at.text_input, "New Name (optional)").input("Gizmo")
+    _widget(at.number_input, "New Price (optional)").set_value(4.0)
+    _widget(at.number_input, "New Stock Quantity (optional)").set_value(1)
+    _widget(at.button, "Update Product").click().run()
+    assert not at.exception
+    assert _products_table(at)[["ID", "Name", "Price", "Stock"]].values.tolist() == [
+        [1, "Widget", "$2.50", 3],
+        [2, "Gizmo", "$4.00", 1],
+    ]
+
+    _widget(at.number_input, "Product ID").set_value(1)
+    _widget(at.button, "Delete Product").click().run()
+    assert not at.exception
+    assert _products_table(at)[["ID", "Name"]].values.tolist() == [[2, "Gizmo"]]
+    assert list(at.session_state["products"]) == [2]
+
+def test_search_results_refresh_after_rename(at):
+    _add_product(at, "Widget", "Tools", 2.5, 3)
+    _widget(at.text_input, "Enter search term").input("widg").run()
+    assert at.dataframe[1].value[["ID", "Name", "Stock"]].values.tolist() == [[1, "Widget", 3]]
+
+    # Same term again after a rename: mut_gen must invalidate the cached rows
+    _widget(at.number_input, "Product ID").set_value(1)
+    _widget(at.text_input, "New Name (optional)").input("Gizmo")
+    _widget(at.number_input, "New Stock Quantity (optional)").set_value(8)
+    _widget(at.button, "Update Product").click().run()
+    assert not at.exception
+    assert len(at.dataframe) == 1
+    assert "No products found" in [info.value for info in at.info]
+
+    _widget(at.text_input, "Enter search term").input("gizmo").run()
+    assert at.dataframe[1].value[["ID", "Name", "Stock"]].values.tolist() == [[1, "Gizmo", 8]]
+
+def test_products_table_is_paginated(at):
+    from product import PAGE_SIZE
+
+    _add_product(at, "item", "misc")
+    assert "Page" not in [element.label for element in at.number_input]
+    for _ in range(PAGE_SIZE):
+        _widget(at.button, "Add Product").click().run()
+    assert not at.exception
+
+    assert len(_products_table(at)) == PAGE_SIZE
+    _widget(at.number_input, "Page").set_value(2).run()
+    assert _products_table(at)["ID"].tolist() == [PAGE_SIZE + 1]
@@ -0,0 +1,77 @@
+import hashlib
+
+from main import InventorySystem, User
+from user_auth import Role, hash_password, verify_password
+
+def test_legacy_sha256_password_is_upgraded_on_check():
+    legacy_hash = hashlib.sha256(b"s3cret").hexdigest()
+    user = User.from_hash("legacy", legacy_hash, Role.USER)
+
+    assert not user.check_password("wrong")
+    assert user.password == legacy_hash
+
+    assert user.check_password("s3cret")
+    assert user.password.startswith("$argon2id$")
+    assert user.check_password("s3cret")
+    assert not user.check_password("wrong")
+
+def test_login_upgrades_legacy_hash():
+    inventory = InventorySystem()
+    inventory.users["legacy"] = User.from_hash("legacy", hashlib.sha256("pässword".encode()).hexdigest(), Role.USER)
+    assert not inventory.login("legacy", "password")
+    assert inventory.login("legacy", "pässword")
+    assert inventory.users["legacy"].password.startswith("$argon2id$")
+    assert inventory.current_user.role is Role.USER
+
+def test_unverifiable_argon2_hash_is_rejected():
+    # Parses as Argon2id but fails verification with "Too few lanes"
+    password_hash = hash_password("s3cret").replace("p=1", "p=0")
+    assert not verify_password(password_hash, "s3cret")
+
+    inventory = InventorySystem()
+    inventory.users["broken"] = User.from_hash("broken", password_hash, Role.USER)
+    assert not inventory.login("broken", "s3cret")
+
+def test_add_users_bulk_skips_existing_and_repeated_usernames(monkeypatch):
+    import user_auth
+
+    pools = []
+    real_pool = user_auth.ThreadPoolExecutor
+
+    def tracking_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(user_auth, "ThreadPoolExecutor", tracking_pool)
+
+    inventory = InventorySystem()
+    admin_hash = inventory.users["admin"].password
+    added = inventory.add_users_bulk([
+        ("admin", "overwritten", Role.USER),
+        ("alice", "alice-pw", Role.USER),
+        ("bob", "bob-pw", Role.ADMIN),
+        ("alice", "second-alice-pw", Role.ADMIN),
+        ("carol", "carol-pw", Role.USER),
+        ("dave", "dave-pw", Role.USER),
+    ])
+
+    assert added == 4
+    assert len(pools) == 1
+    assert inventory.users["admin"].password == admin_hash
+    assert inventory.users["admin"].role is Role.ADMIN
+    assert inventory.login("admin", "admin123")
+    for username in ("alice", "bob", "carol", "dave"):
+        assert inventory.login(username, f"{username}-pw")
+    assert not inventory.login("alice", "second-alice-pw")
+    assert inventory.users["alice"].role is Role.USER
+    assert inventory.users["bob"].role is Role.ADMIN
+
+def test_hash_passwords_small_batch_is_serial(monkeypatch):
+    import user_auth
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("thread pool used for a small batch")
+
+    monkeypatch.setattr(user_auth, "ThreadPoolExecutor", no_pool)
+    hashes = user_auth.hash_passwords(["a", "b", "c"])
+    assert [verify_password(h, p) for h, p in zip(hashes, "abc")] == [True, True, True]